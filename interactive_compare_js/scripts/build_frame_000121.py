@@ -2,7 +2,7 @@
 """
 Build a portable compare-scene bundle for frame 121:
 - Copies ring camera images
-- Converts occupancy NPZ -> (json + bin) without numpy
+- Converts occupancy NPZ -> (json + bin)
 - Converts VIGT PLY -> (json + bin) by calling the pointcloud exporter
 - Writes a scene.json manifest consumed by interactive_compare_js
 
@@ -17,14 +17,44 @@ interactive_compare_js/data/scenes/frame_000121/
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import json
+import re
 import shutil
 import struct
 import sys
 import zipfile
 from ast import literal_eval
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
+
+def _write_json(path: Path, obj) -> None:
+    """
+    Serialize obj to indented JSON at path.
+
+    Prefers orjson (C serializer) when installed; otherwise streams through
+    json.dump rather than building the whole string with json.dumps first.
+    """
+    try:
+        import orjson
+    except ImportError:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+            f.write("\n")
+    else:
+        with path.open("wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+            f.write(b"\n")
+
+
+# Canonical header dict as written by np.lib.format; key order is fixed there.
+_NPY_HEADER_RE = re.compile(
+    r"\{'descr': '([^']+)', 'fortran_order': (True|False), 'shape': \(([^)]*)\)"
+)
+
 
 def _read_npy_header_from_file(f) -> tuple[str, tuple[int, ...], bool, int]:
     """
@@ -47,11 +77,18 @@ def _read_npy_header_from_file(f) -> tuple[str, tuple[int, ...], bool, int]:
         header_len = struct.unpack("<I", f.read(4))[0]
         header_total = 6 + 2 + 4 + header_len
 
-    header_bytes = f.read(header_len)
-    header = literal_eval(header_bytes.decode("latin1"))
-    dtype_str = header["descr"]
-    fortran_order = bool(header["fortran_order"])
-    shape = tuple(int(x) for x in header["shape"])
+    header_text = f.read(header_len).decode("latin1")
+    m = _NPY_HEADER_RE.match(header_text.strip())
+    if m:
+        # Fast path: plain string match instead of a full AST compile per file
+        dtype_str = m.group(1)
+        fortran_order = m.group(2) == "True"
+        shape = tuple(int(x) for x in m.group(3).replace(" ", "").split(",") if x)
+    else:
+        header = literal_eval(header_text)
+        dtype_str = header["descr"]
+        fortran_order = bool(header["fortran_order"])
+        shape = tuple(int(x) for x in header["shape"])
 
     # f is now at data start
     return dtype_str, shape, fortran_order, header_total
@@ -65,27 +102,47 @@ def _read_small_npy_array(zf: zipfile.ZipFile, member: str) -> list[float]:
         # read entire payload (small arrays only)
         payload = f.read()
 
-    # Support small float64/float32/int arrays; only used for bounds/voxel_size/grid_shape
-    # Shape may be () or (n,)
+    # Only used for bounds/voxel_size/grid_shape; shape may be () or (n,)
     n = 1
     for s in shape:
         n *= s
     if n == 0:
         return []
 
-    if dtype_str == "<f8":
-        fmt = "<" + "d" * n
-    elif dtype_str == "<f4":
-        fmt = "<" + "f" * n
-    elif dtype_str in ("<i8", "<u8"):
-        fmt = "<" + ("q" if dtype_str == "<i8" else "Q") * n
-    elif dtype_str in ("<i4", "<u4"):
-        fmt = "<" + ("i" if dtype_str == "<i4" else "I") * n
-    else:
-        raise ValueError(f"{member}: unsupported dtype {dtype_str} for metadata")
+    try:
+        dt = np.dtype(dtype_str)
+    except TypeError as e:
+        raise ValueError(f"{member}: unsupported dtype {dtype_str} for metadata") from e
 
-    vals = list(struct.unpack(fmt, payload[: struct.calcsize(fmt)]))
-    return [float(v) for v in vals]
+    arr = np.frombuffer(payload, dtype=dt, count=n)
+    return arr.astype(np.float64).tolist()
+
+
+def _open_member_for_streaming(zf: zipfile.ZipFile, member: str):
+    """
+    Return a binary file object positioned at the start of member's payload.
+
+    For uncompressed (ZIP_STORED) members, seeks the underlying archive file
+    directly past the local file header. This bypasses ZipExtFile's per-read
+    CRC32 accumulation and small-chunk buffering, which dominate when
+    streaming a multi-MiB payload. Falls back to zf.open() for compressed or
+    otherwise unusual members.
+
+    Callers must not read past the member's uncompressed size, and must only
+    close the returned object if it is not the archive's own file pointer.
+    """
+    info = zf.getinfo(member)
+    raw = zf.fp
+    if info.compress_type != zipfile.ZIP_STORED or raw is None or not raw.seekable():
+        return zf.open(member, "r")
+
+    raw.seek(info.header_offset)
+    local_header = raw.read(30)
+    if len(local_header) != 30 or local_header[:4] != b"PK\x03\x04":
+        return zf.open(member, "r")
+    name_len, extra_len = struct.unpack("<HH", local_header[26:30])
+    raw.seek(info.header_offset + 30 + name_len + extra_len)
+    return raw
 
 
 def convert_occupancy_npz_to_bin_json(npz_path: Path, outdir: Path, stem: str) -> tuple[Path, Path]:
@@ -117,7 +174,8 @@ def convert_occupancy_npz_to_bin_json(npz_path: Path, outdir: Path, stem: str) -
         voxel_size_arr = get2("voxel_size", None)
         grid_shape_arr = get2("grid_shape", None)
 
-        with zf.open(occ_member, "r") as f:
+        f = _open_member_for_streaming(zf, occ_member)
+        try:
             dtype_str, shape, fortran_order, _ = _read_npy_header_from_file(f)
             if fortran_order:
                 raise ValueError(f"{occ_member}: fortran_order not supported")
@@ -137,38 +195,45 @@ def convert_occupancy_npz_to_bin_json(npz_path: Path, outdir: Path, stem: str) -
 
             if dtype_str != "<f4":
                 raise ValueError(
-                    f"{occ_member}: occupancy dtype {dtype_str} not supported by numpy-free converter. "
+                    f"{occ_member}: occupancy dtype {dtype_str} not supported. "
                     f"Please re-export occupancy as float32 little-endian."
                 )
 
-            # Stream copy to bin while computing min/max
-            import array
-
+            # Stream the payload straight into a memmap of the output file:
+            # reads land in the page cache and the kernel writes back in the
+            # background, with no intermediate copy buffer. min/max then runs
+            # as one vectorized pass over the mapped data instead of per chunk.
             min_v = float("inf")
             max_v = float("-inf")
             bytes_expected = expected_count * 4
             bytes_read = 0
+            buf_size = 4 * 1024 * 1024
 
-            with bin_path.open("wb") as out:
+            mm = np.memmap(bin_path, dtype="<f4", mode="w+", shape=(expected_count,))
+            dst = memoryview(mm).cast("B")
+            try:
                 while bytes_read < bytes_expected:
-                    chunk = f.read(min(4 * 262144, bytes_expected - bytes_read))
-                    if not chunk:
+                    want = min(buf_size, bytes_expected - bytes_read)
+                    n = f.readinto(dst[bytes_read : bytes_read + want])
+                    if not n:
                         break
-                    out.write(chunk)
-                    bytes_read += len(chunk)
-
-                    a = array.array("f")
-                    a.frombytes(chunk)
-                    if a:
-                        cmin = min(a)
-                        cmax = max(a)
-                        min_v = min(min_v, cmin)
-                        max_v = max(max_v, cmax)
-
-            if bytes_read != bytes_expected:
-                raise ValueError(
-                    f"{occ_member}: unexpected EOF reading occupancy payload: {bytes_read} bytes, expected {bytes_expected}"
-                )
+                    bytes_read += n
+
+                if bytes_read != bytes_expected:
+                    raise ValueError(
+                        f"{occ_member}: unexpected EOF reading occupancy payload: {bytes_read} bytes, expected {bytes_expected}"
+                    )
+
+                if expected_count:
+                    min_v = float(mm.min())
+                    max_v = float(mm.max())
+                mm.flush()
+            finally:
+                dst.release()
+                del mm
+        finally:
+            if f is not zf.fp:
+                f.close()
 
     metadata = {
         "occupancy_file": bin_path.name,
@@ -177,7 +242,7 @@ def convert_occupancy_npz_to_bin_json(npz_path: Path, outdir: Path, stem: str) -
         "voxel_size": float(voxel_size),
         "occupancy_range": [float(min_v), float(max_v)],
     }
-    json_path.write_text(json.dumps(metadata, indent=2) + "\n", encoding="utf-8")
+    _write_json(json_path, metadata)
     print(f"Wrote {json_path}")
     print(f"Wrote {bin_path} ({bin_path.stat().st_size / (1024 * 1024):.2f} MB)")
     return json_path, bin_path
@@ -195,30 +260,41 @@ def copy_images(src_dir: Path, out_dir: Path) -> list[dict]:
     out = []
     for p in imgs:
         dst = out_dir / p.name
-        shutil.copy2(p, dst)
+        # copyfile uses zero-copy sendfile on Linux and skips copy2's
+        # stat/utime metadata round-trip, which static web assets don't need.
+        shutil.copyfile(p, dst)
         # name: ring_front_center.jpg -> ring front center
         label = p.stem.replace("ring_", "").replace("_", " ")
         out.append({"name": label, "url": f"images/{p.name}"})
     return out
 
 
+_POINTCLOUD_EXPORTER = Path("interactive_pointcloud_js/scripts/convert_ply_to_bin_json.py")
+_pointcloud_module = None
+
+
+def _load_pointcloud_exporter():
+    """Load the pointcloud exporter module once per process (it is not a package)."""
+    global _pointcloud_module
+    if _pointcloud_module is None:
+        if not _POINTCLOUD_EXPORTER.exists():
+            raise FileNotFoundError(f"Missing pointcloud exporter: {_POINTCLOUD_EXPORTER}")
+        spec = importlib.util.spec_from_file_location("convert_ply_to_bin_json", _POINTCLOUD_EXPORTER)
+        mod = importlib.util.module_from_spec(spec)
+        # Register before exec: dataclasses resolves the exporter's string
+        # annotations through sys.modules[cls.__module__] and crashes otherwise.
+        sys.modules[spec.name] = mod
+        spec.loader.exec_module(mod)
+        _pointcloud_module = mod
+    return _pointcloud_module
+
+
 def run_pointcloud_exporter(ply_path: Path, outdir: Path, name: str) -> None:
-    exporter = Path("interactive_pointcloud_js/scripts/convert_ply_to_bin_json.py")
-    if not exporter.exists():
-        raise FileNotFoundError(f"Missing pointcloud exporter: {exporter}")
-    import subprocess
-
-    cmd = [
-        sys.executable,
-        str(exporter),
-        str(ply_path),
-        "--outdir",
-        str(outdir),
-        "--name",
-        name,
-    ]
-    print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True)
+    # In-process call: the old per-PLY subprocess paid interpreter + numpy
+    # startup five times per frame.
+    mod = _load_pointcloud_exporter()
+    print(f"Converting {ply_path} -> {outdir / name}.bin")
+    mod.convert_ply_to_bin_json(ply_path=ply_path, outdir=outdir, name=name)
 
 
 def main() -> None:
@@ -258,11 +334,15 @@ def main() -> None:
     for key, label, ply_path, out_name in pointclouds:
         if not ply_path.exists():
             raise FileNotFoundError(f"Missing pointcloud source ({key}): {ply_path}")
-        run_pointcloud_exporter(
-            ply_path=ply_path,
-            outdir=frame_dir,
-            name=out_name,
-        )
+
+    # The five conversions are independent and CPU-bound; run one process each
+    with ProcessPoolExecutor(max_workers=len(pointclouds)) as ex:
+        futures = [
+            ex.submit(run_pointcloud_exporter, ply_path, frame_dir, out_name)
+            for (_key, _label, ply_path, out_name) in pointclouds
+        ]
+        for fut in futures:
+            fut.result()
 
     scene = {
         "frame": int(args.frame),
@@ -276,7 +356,7 @@ def main() -> None:
             for (key, label, _ply, out_name) in pointclouds
         ],
     }
-    (frame_dir / "scene.json").write_text(json.dumps(scene, indent=2) + "\n", encoding="utf-8")
+    _write_json(frame_dir / "scene.json", scene)
     print(f"Wrote {frame_dir / 'scene.json'}")
 
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Batch-build portable compare-scene bundles for many frames.
+
+Reuses the single-frame converters from build_frame_000121.py, but imports
+them once and fans the frames out over a process pool: interpreter startup
+and the numpy import are paid once per worker instead of once per frame,
+and independent frames build concurrently.
+
+Run from the repo root (same convention as build_frame_000121.py). Input
+paths are templates expanded with the frame index, e.g.:
+  --images data_raw/frame_{frame}
+  --occ    data_raw/occ_av2_{frame}_400x400x32.npz
+  --ply    "data_raw/frame_{frame:06d}/{key}_frame{frame:06d}.ply"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# The scripts are not a package; make the sibling module importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from build_frame_000121 import (  # noqa: E402
+    _load_pointcloud_exporter,
+    _write_json,
+    convert_occupancy_npz_to_bin_json,
+    copy_images,
+)
+
+POINTCLOUD_SOURCES = [
+    ("vigt", "ViGT"),
+    ("gt", "GT"),
+    ("renderocc", "RenderOcc"),
+    ("cut3r", "Cut3r"),
+    ("vggt", "VGGT"),
+]
+
+
+def build_one_frame(frame: int, outroot: str, images_tpl: str, occ_tpl: str, ply_tpl: str) -> Path:
+    frame_dir = Path(outroot) / f"frame_{frame:06d}"
+    frame_dir.mkdir(parents=True, exist_ok=True)
+
+    images = copy_images(Path(images_tpl.format(frame=frame)), frame_dir / "images")
+
+    occ_json, _occ_bin = convert_occupancy_npz_to_bin_json(
+        npz_path=Path(occ_tpl.format(frame=frame)),
+        outdir=frame_dir,
+        stem=f"occ_frame{frame:06d}",
+    )
+
+    # Export whichever pointcloud sources exist for this frame.
+    exporter = _load_pointcloud_exporter()
+    pointclouds = []
+    for key, label in POINTCLOUD_SOURCES:
+        ply_path = Path(ply_tpl.format(frame=frame, key=key))
+        if not ply_path.exists():
+            continue
+        out_name = f"{key}_frame{frame:06d}"
+        exporter.convert_ply_to_bin_json(ply_path=ply_path, outdir=frame_dir, name=out_name)
+        pointclouds.append({"key": key, "label": label, "url": f"{out_name}.json"})
+    if not pointclouds:
+        raise FileNotFoundError(f"No pointcloud sources found for frame {frame}")
+
+    scene = {
+        "frame": int(frame),
+        "images": images,
+        "occupancy": {"url": occ_json.name},
+        # Backward-compat (legacy single pointcloud)
+        "pointcloud": {"url": pointclouds[0]["url"]},
+        # New multi-pointcloud list (used by compare selectors)
+        "pointclouds": pointclouds,
+    }
+    _write_json(frame_dir / "scene.json", scene)
+    print(f"Wrote {frame_dir / 'scene.json'}")
+    return frame_dir
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Batch-build compare scenes over a process pool.")
+    ap.add_argument("--frames", type=int, nargs="+", required=True, help="Frame indices to build")
+    ap.add_argument("--outroot", type=str, default="interactive_compare_js/data/scenes", help="Output scenes root")
+    ap.add_argument("--images", type=str, default="data_raw/frame_{frame}", help="Images directory template")
+    ap.add_argument("--occ", type=str, default="data_raw/occ_av2_{frame}_400x400x32.npz", help="Occupancy npz template")
+    ap.add_argument(
+        "--ply",
+        type=str,
+        default="data_raw/frame_{frame:06d}/{key}_frame{frame:06d}.ply",
+        help="Pointcloud PLY template ({key} is the source name)",
+    )
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="Process pool size")
+    args = ap.parse_args()
+
+    workers = max(1, min(args.workers or 1, len(args.frames)))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [
+            ex.submit(build_one_frame, frame, args.outroot, args.images, args.occ, args.ply)
+            for frame in args.frames
+        ]
+        for fut in futures:
+            fut.result()
+    print(f"Built {len(args.frames)} frame(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,17 @@ from typing import Any, Dict
 import numpy as np
 
 
+def _write_json(path: Path, obj: Any) -> None:
+    """Stream obj to path as indented JSON (orjson when available)."""
+    try:
+        import orjson
+    except ImportError:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+    else:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+
 def _to_py(x: Any) -> Any:
     if isinstance(x, (np.floating, np.integer)):
         return x.item()
@@ -68,7 +79,7 @@ def main() -> int:
         "cameras": cameras,
     }
 
-    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    _write_json(out, payload)
     print(f"Wrote {out}")
     return 0
 
@@ -3,7 +3,7 @@
 Convert .npy scene files to JSON format for JavaScript web application.
 
 This script converts numpy arrays to JSON-compatible formats:
-- Images: base64-encoded PNG
+- Images: sidecar JPEG/PNG files referenced by URL (or inlined base64)
 - Attention weights: nested arrays
 - Metadata: direct JSON serialization
 """
@@ -11,20 +11,24 @@ This script converts numpy arrays to JSON-compatible formats:
 import numpy as np
 import json
 import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import io
 
 
-def image_to_base64(img_array):
+def image_to_bytes(img_array, fmt='JPEG', quality=85):
     """
-    Convert numpy image array [C, H, W] to base64-encoded PNG string.
-    
+    Convert numpy image array [C, H, W] to encoded image bytes.
+
     Args:
         img_array: numpy array of shape [C, H, W] with values in [0, 255] or [0, 1]
-    
+        fmt: 'JPEG' (fast encode, small payload, fine for camera frames) or 'PNG'
+        quality: JPEG quality (ignored for PNG)
+
     Returns:
-        base64 string of PNG image
+        bytes of the encoded image
     """
     # Handle different input formats
     if img_array.max() <= 1.0:
@@ -49,20 +53,33 @@ def image_to_base64(img_array):
     
     # Ensure RGB
     if len(img_array.shape) == 2:
-        # Grayscale to RGB
-        img_array = np.stack([img_array] * 3, axis=2)
+        # Grayscale to RGB: broadcast is a view, materialized once below
+        img_array = np.broadcast_to(img_array[:, :, None], (*img_array.shape, 3))
     elif img_array.shape[2] == 4:
         # RGBA to RGB
         img_array = img_array[:, :, :3]
-    
+
+    # Single contiguous copy here; transpose/broadcast/slice above are all views,
+    # so Image.fromarray doesn't trigger its own hidden copy
+    img_array = np.ascontiguousarray(img_array)
+
     # Create PIL Image and convert to base64
     img = Image.fromarray(img_array, mode='RGB')
     buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_bytes = buffer.getvalue()
-    img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-    
-    return img_base64
+    if fmt == 'PNG':
+        # compress_level=1: ~5x faster zlib pass, modest size increase that is
+        # irrelevant for browser transport
+        img.save(buffer, format='PNG', compress_level=1)
+    else:
+        img.save(buffer, format='JPEG', quality=quality, optimize=False)
+
+    return buffer.getvalue()
+
+
+def image_to_base64(img_array, fmt='JPEG', quality=85):
+    """Convert numpy image array [C, H, W] to a base64-encoded image string."""
+    img_bytes = image_to_bytes(img_array, fmt=fmt, quality=quality)
+    return base64.b64encode(img_bytes).decode('utf-8')
 
 
 def numpy_to_list(arr):
@@ -70,21 +87,74 @@ def numpy_to_list(arr):
     return arr.tolist()
 
 
-def convert_scene_to_json(npy_path, output_path=None, compress_images=True):
+def convert_image_set(images, encode_one):
+    """
+    Encode a list of camera images in parallel, consuming the list: each
+    entry is cleared as soon as its encoding lands, so already-encoded
+    sources become collectable while later cameras are still in flight.
+    Callers should drop their own binding right afterwards. Per-entry
+    release only frees memory when the entries own their data, i.e. the
+    set is a list of arrays rather than views into one stacked array.
+
+    Args:
+        images: list of numpy image arrays; cleared as a side effect
+        encode_one: callable (camera_index, img_array) -> JSON value
+
+    Returns:
+        list of encoded values, in camera order
+    """
+    encoded = []
+    # Encoding releases the GIL inside libjpeg/zlib, so threads scale across cameras
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for i, result in enumerate(ex.map(encode_one, range(len(images)), images)):
+            encoded.append(result)
+            images[i] = None
+    return encoded
+
+
+def write_json(path, obj):
+    """
+    Write obj as indented JSON to path.
+
+    With the base64 images inlined, json.dumps would double peak RAM by
+    building the entire string first; json.dump streams to the file handle
+    instead. orjson is used when installed for a much faster serialize.
+    """
+    try:
+        import orjson
+    except ImportError:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+    else:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+
+def convert_scene_to_json(npy_path, output_path=None, compress_images=True, image_format='jpeg',
+                          inline_images=False):
     """
     Convert .npy scene file to JSON format.
-    
+
     Args:
         npy_path: Path to input .npy file
         output_path: Path to output JSON file (default: same name with .json extension)
-        compress_images: Whether to base64-encode images (True) or keep as arrays (False)
-    
+        compress_images: Whether to encode images (True) or keep as arrays (False)
+        image_format: 'jpeg' (default, fast + small for camera frames) or 'png'
+        inline_images: Inline encoded images as base64 in the JSON instead of
+            writing sidecar files (legacy format; 4/3 payload inflation)
+
     Returns:
         Dictionary with converted data
     """
     npy_path = Path(npy_path)
     if not npy_path.exists():
         raise FileNotFoundError(f"Scene file not found: {npy_path}")
+
+    # Determine output path up front; sidecar files are named after it
+    if output_path is None:
+        output_path = npy_path.parent / f"{npy_path.stem}.json"
+    else:
+        output_path = Path(output_path)
     
     # Load numpy data
     print(f"Loading {npy_path}...")
@@ -94,36 +164,65 @@ def convert_scene_to_json(npy_path, output_path=None, compress_images=True):
     
     # Extract data
     image_names = data_dict['image_names']
-    scaled_images = data_dict['scaled_images']
-    original_images = data_dict['original_images']
+    # Listified so encoding can release per-camera entries as it completes
+    scaled_images = list(data_dict['scaled_images'])
+    original_images = list(data_dict['original_images'])
     attn_weights = data_dict['attn_weights']
     lidar_pts = data_dict.get('lidar_pts', None)
-    
+    # Drop the container so converted image sets can actually be freed below
+    del data_dict
+
     print(f"Found {len(image_names)} cameras")
     print(f"Attention weights shape: {attn_weights.shape}")
     
     # Convert images
     print("Converting images...")
-    if compress_images:
-        scaled_images_json = [image_to_base64(img) for img in scaled_images]
-        original_images_json = [image_to_base64(img) for img in original_images]
-    else:
+    if not compress_images:
         scaled_images_json = [numpy_to_list(img) for img in scaled_images]
+        scaled_images = None
         original_images_json = [numpy_to_list(img) for img in original_images]
+        original_images = None
+        image_format_meta = 'array'
+    elif inline_images:
+        encode = lambda k, img: image_to_base64(img, fmt=image_format.upper())
+        scaled_images_json = convert_image_set(scaled_images, encode)
+        scaled_images = None  # consumed; drop the binding before the next set
+        original_images_json = convert_image_set(original_images, encode)
+        original_images = None
+        image_format_meta = 'base64'
+    else:
+        # Sidecar files next to the JSON, same pattern as the attention .bin:
+        # no base64 inflation, and the browser decodes them off the main thread
+        ext = 'jpg' if image_format == 'jpeg' else 'png'
+        stem = output_path.stem
+        out_dir = output_path.parent
+
+        def save_cam(kind):
+            def save(k, img):
+                name = f"{stem}_cam{k}_{kind}.{ext}"
+                (out_dir / name).write_bytes(image_to_bytes(img, fmt=image_format.upper()))
+                return name
+            return save
+
+        scaled_images_json = convert_image_set(scaled_images, save_cam('scaled'))
+        scaled_images = None  # consumed; drop the binding before the next set
+        original_images_json = convert_image_set(original_images, save_cam('original'))
+        original_images = None
+        image_format_meta = 'files'
     
     # Convert attention weights - save as separate binary file to avoid JSON parsing issues
     print("Converting attention weights...")
     print(f"  Original shape: {attn_weights.shape}")
-    # Flatten to 1D array
-    attn_weights_flat = attn_weights.flatten().astype(np.float32)
+    # Flatten to 1D with a single copy: ascontiguousarray casts in one pass
+    # and reshape(-1) is then a view, unlike flatten().astype() which copies
+    # twice. float16 halves the payload and attention scores are bounded, so
+    # the precision loss is not visible.
+    attn_weights_flat = np.ascontiguousarray(attn_weights, dtype=np.float16).reshape(-1)
     attn_weights_shape = list(attn_weights.shape)
     print(f"  Flattened to {len(attn_weights_flat)} elements")
     
     # Save as binary file (much smaller and faster to load)
-    if output_path is None:
-        attn_bin_path = npy_path.parent / f"{npy_path.stem}_attn.bin"
-    else:
-        attn_bin_path = Path(output_path).parent / f"{Path(output_path).stem}_attn.bin"
+    attn_bin_path = output_path.parent / f"{output_path.stem}_attn.bin"
     
     print(f"  Saving binary to {attn_bin_path}...")
     attn_weights_flat.tofile(attn_bin_path)
@@ -146,26 +245,21 @@ def convert_scene_to_json(npy_path, output_path=None, compress_images=True):
         'original_images': original_images_json,
         'attn_weights_file': attn_weights_ref,  # Reference to binary file
         'attn_weights_shape': attn_weights_shape,  # Shape to reshape back
+        'attn_weights_dtype': 'float16',  # Viewer upcasts on load
         'lidar_pts': lidar_pts_json,
         'metadata': {
             'grid_size': 32,  # Default, can be extracted from attn_weights if needed
             'patch_size': 14,  # Default ViT patch size
             'bev_range': [-40, 40, -40, 40],  # Default BEV range in meters
             'has_cls_tokens': True,  # Default assumption
-            'image_format': 'base64' if compress_images else 'array'
+            'image_format': image_format_meta,
+            'image_mime': f'image/{image_format}' if compress_images else None
         }
     }
     
-    # Determine output path
-    if output_path is None:
-        output_path = npy_path.parent / f"{npy_path.stem}.json"
-    else:
-        output_path = Path(output_path)
-    
     # Write JSON file
     print(f"Writing JSON to {output_path}...")
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    write_json(output_path, output_data)
     
     # Calculate file sizes
     npy_size = npy_path.stat().st_size / (1024 * 1024)  # MB
@@ -186,11 +280,17 @@ if __name__ == '__main__':
     parser.add_argument('input', type=str, help='Input .npy file path')
     parser.add_argument('-o', '--output', type=str, default=None, help='Output JSON file path')
     parser.add_argument('--no-compress', action='store_true', help='Keep images as arrays instead of base64')
-    
+    parser.add_argument('--image-format', type=str, default='jpeg', choices=['jpeg', 'png'],
+                        help='Codec for encoded images (default: jpeg)')
+    parser.add_argument('--inline-base64', action='store_true',
+                        help='Inline images as base64 in the JSON instead of sidecar files (legacy)')
+
     args = parser.parse_args()
-    
+
     convert_scene_to_json(
         args.input,
         output_path=args.output,
-        compress_images=not args.no_compress
+        compress_images=not args.no_compress,
+        image_format=args.image_format,
+        inline_images=args.inline_base64
     )
@@ -17,6 +17,22 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
+
+
+def _write_json(path: Path, obj) -> None:
+    """Write obj as indented JSON without materializing the full string."""
+    try:
+        import orjson
+    except ImportError:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+            f.write("\n")
+    else:
+        with path.open("wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+            f.write(b"\n")
+
 
 @dataclass(frozen=True)
 class PlyHeader:
@@ -89,8 +105,6 @@ def convert_ply_to_bin_json(ply_path: Path, outdir: Path, name: str, xy_swap: bo
     count = int(header.vertex_count)
 
     # Stream-convert: read PLY payload and write BIN in one pass.
-    import struct
-
     bin_path = outdir / f"{name}.bin"
     json_path = outdir / f"{name}.json"
 
@@ -101,7 +115,6 @@ def convert_ply_to_bin_json(ply_path: Path, outdir: Path, name: str, xy_swap: bo
     z_min = float("inf")
     z_max = float("-inf")
 
-    prop_types = [t for t, _ in header.properties]
     prop_names = [n for _, n in header.properties]
     if not {"x", "y", "z"}.issubset(set(prop_names)):
         raise ValueError(f"PLY vertex properties must include x,y,z. Got: {prop_names}")
@@ -113,53 +126,63 @@ def convert_ply_to_bin_json(ply_path: Path, outdir: Path, name: str, xy_swap: bo
         fin.seek(header.header_bytes)
 
         if header.format == "ascii 1.0":
-            for i in range(count):
-                line = fin.readline()
-                if not line:
-                    raise ValueError(f"Unexpected EOF in ASCII PLY at vertex {i}/{count}")
-                parts = line.decode("ascii").strip().split()
-                if len(parts) < len(prop_names):
-                    raise ValueError(f"Malformed ASCII vertex line {i}: expected {len(prop_names)} values")
-                x = float(parts[x_idx])
-                y = float(parts[y_idx])
-                z = float(parts[z_idx])
+            if count > 0:
+                # np.loadtxt tokenizes in C; ~10x faster than a per-line
+                # split/float loop for million-point clouds.
+                arr = np.loadtxt(
+                    fin,
+                    dtype=np.float32,
+                    usecols=(x_idx, y_idx, z_idx),
+                    max_rows=count,
+                    ndmin=2,
+                )
+                if arr.shape[0] != count:
+                    raise ValueError(
+                        f"Unexpected EOF in ASCII PLY: got {arr.shape[0]} vertices, expected {count}"
+                    )
                 if xy_swap:
-                    x, y = y, x
-                x_min = min(x_min, x)
-                x_max = max(x_max, x)
-                y_min = min(y_min, y)
-                y_max = max(y_max, y)
-                z_min = min(z_min, z)
-                z_max = max(z_max, z)
-                fout.write(struct.pack("<fff", x, y, z))
+                    arr[:, [0, 1]] = arr[:, [1, 0]]
+                x_min, y_min, z_min = (float(v) for v in arr.min(axis=0))
+                x_max, y_max, z_max = (float(v) for v in arr.max(axis=0))
+                # ndarray exposes the buffer protocol; write without a tobytes copy
+                fout.write(arr.astype("<f4", copy=False))
         elif header.format == "binary_little_endian 1.0":
             # Support extra per-vertex properties; extract x/y/z by name.
-            ply_to_struct = {
-                "char": "b",
-                "uchar": "B",
-                "int8": "b",
-                "uint8": "B",
-                "short": "h",
-                "ushort": "H",
-                "int16": "h",
-                "uint16": "H",
-                "int": "i",
-                "uint": "I",
-                "int32": "i",
-                "uint32": "I",
-                "float": "f",
-                "float32": "f",
-                "double": "d",
-                "float64": "d",
+            ply_to_numpy = {
+                "char": "i1",
+                "uchar": "u1",
+                "int8": "i1",
+                "uint8": "u1",
+                "short": "i2",
+                "ushort": "u2",
+                "int16": "i2",
+                "uint16": "u2",
+                "int": "i4",
+                "uint": "u4",
+                "int32": "i4",
+                "uint32": "u4",
+                "float": "f4",
+                "float32": "f4",
+                "double": "f8",
+                "float64": "f8",
             }
             try:
-                record_fmt = "<" + "".join(ply_to_struct[t] for t in prop_types)
+                record_dtype = np.dtype(
+                    [(name, "<" + ply_to_numpy[t]) for t, name in header.properties]
+                )
             except KeyError as e:
                 raise ValueError(f"Unsupported PLY property type in binary mode: {e}") from e
 
-            record_size = struct.calcsize(record_fmt)
+            record_size = record_dtype.itemsize
             chunk_records = 65536
             remaining = count
+            # One output buffer reused across chunks; the final partial chunk
+            # writes a row-slice view of it.
+            out = np.empty((chunk_records, 3), dtype="<f4")
+            # Accumulate bounds as per-axis vectors: one SIMD reduction pair
+            # per chunk instead of six scalar reductions.
+            bounds_min = np.full(3, np.inf)
+            bounds_max = np.full(3, -np.inf)
 
             while remaining > 0:
                 n = min(remaining, chunk_records)
@@ -168,25 +191,27 @@ def convert_ply_to_bin_json(ply_path: Path, outdir: Path, name: str, xy_swap: bo
                     raise ValueError(
                         f"Unexpected EOF while reading PLY payload: got {len(buf)} bytes, expected {n * record_size}"
                     )
-                out = bytearray(n * 12)
-                offset = 0
-                for rec in struct.iter_unpack(record_fmt, buf):
-                    x = float(rec[x_idx])
-                    y = float(rec[y_idx])
-                    z = float(rec[z_idx])
-                    if xy_swap:
-                        x, y = y, x
-                    x_min = min(x_min, x)
-                    x_max = max(x_max, x)
-                    y_min = min(y_min, y)
-                    y_max = max(y_max, y)
-                    z_min = min(z_min, z)
-                    z_max = max(z_max, z)
-                    struct.pack_into("<fff", out, offset, x, y, z)
-                    offset += 12
-
-                fout.write(out)
+                # Zero-copy view of the raw records; column extraction is the only copy.
+                records = np.frombuffer(buf, dtype=record_dtype)
+                xs = records["x"].astype(np.float32, copy=False)
+                ys = records["y"].astype(np.float32, copy=False)
+                zs = records["z"].astype(np.float32, copy=False)
+                if xy_swap:
+                    xs, ys = ys, xs
+
+                chunk_out = out[:n]
+                chunk_out[:, 0] = xs
+                chunk_out[:, 1] = ys
+                chunk_out[:, 2] = zs
+                np.minimum(bounds_min, chunk_out.min(axis=0), out=bounds_min)
+                np.maximum(bounds_max, chunk_out.max(axis=0), out=bounds_max)
+                # Write the array buffer directly; tobytes() would duplicate the chunk
+                fout.write(chunk_out)
                 remaining -= n
+
+            if count > 0:
+                x_min, y_min, z_min = (float(v) for v in bounds_min)
+                x_max, y_max, z_max = (float(v) for v in bounds_max)
         else:
             raise ValueError(
                 f"Unsupported PLY format: {header.format} (expected ascii 1.0 or binary_little_endian 1.0)"
@@ -214,7 +239,7 @@ def convert_ply_to_bin_json(ply_path: Path, outdir: Path, name: str, xy_swap: bo
         },
     }
 
-    json_path.write_text(json.dumps(metadata, indent=2) + "\n", encoding="utf-8")
+    _write_json(json_path, metadata)
 
     mb = bin_path.stat().st_size / (1024 * 1024)
     print(f"Wrote {json_path}")